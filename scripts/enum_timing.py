@@ -0,0 +1,54 @@
+# ruff: noqa: T201
+
+"""Compare the speed of common operations on pycp's internal enum against stdlib enum."""
+
+import enum
+import timeit
+from collections.abc import Callable
+
+from pycp import _enum as internal_enum
+
+
+# Members v1 to v20 with the values 1 to 20. Enough members for iteration to be more than a couple of steps.
+MEMBER_NAMES = [f"v{i}" for i in range(1, 21)]
+
+StdlibEnum = enum.Enum("StdlibEnum", MEMBER_NAMES)
+PyCCEnum = internal_enum.create("PyCCEnum", MEMBER_NAMES)
+
+
+def lookup_miss(enum_cls: Callable[[object], object]) -> None:
+    try:
+        enum_cls(999)
+    except ValueError:
+        pass
+
+
+OPERATIONS: dict[str, Callable[[type], Callable[[], object]]] = {
+    "by-value lookup": lambda enum_cls: lambda: enum_cls(1),
+    "by-value lookup (miss)": lambda enum_cls: lambda: lookup_miss(enum_cls),
+    "member.name": lambda enum_cls: lambda member=enum_cls.v1: member.name,
+    "member.value": lambda enum_cls: lambda member=enum_cls.v1: member.value,
+    "iteration (20 members)": lambda enum_cls: lambda: [None for _ in enum_cls],
+    "member in Enum": lambda enum_cls: lambda member=enum_cls.v1: member in enum_cls,
+    "member == Enum.member": lambda enum_cls: lambda member=enum_cls.v1: member == enum_cls.v1,
+}
+
+
+def time_per_call(func: Callable[[], object]) -> float:
+    """Give the best time per call in seconds, like the timeit CLI: autorange the loop count, then take the minimum."""
+
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main() -> None:
+    print(f"{'operation':<24} {'stdlib':>10} {'pycp':>10} {'ratio':>7}")
+    for name, make_func in OPERATIONS.items():
+        stdlib_time = time_per_call(make_func(StdlibEnum))
+        pycp_time = time_per_call(make_func(PyCCEnum))
+        print(f"{name:<24} {stdlib_time * 1e9:>8.1f}ns {pycp_time * 1e9:>8.1f}ns {pycp_time / stdlib_time:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
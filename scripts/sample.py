@@ -1,24 +1,38 @@
 # ruff: noqa: ERA001, T201, T203
 
+import statistics
 import time
+from collections.abc import Callable, Iterable
 from pprint import pprint
 
 from pycp.preprocessor import Preprocessor
+from pycp.token import Token
 from pycp.tokenizer import Tokenizer
 
 
-class TimeCatcher:
-    elapsed: float
+REPEAT = 50
 
-    def __init__(self):
-        self.elapsed = 0.0
 
-    def __enter__(self):
-        self.elapsed = time.perf_counter()
-        return self
+def time_repeatedly(make_tokens: Callable[[], Iterable[Token]], repeat: int = REPEAT) -> list[float]:
+    """Time consuming a fresh token stream over several runs after a warm-up run.
 
-    def __exit__(self, *_exc_info: object):
-        self.elapsed = time.perf_counter() - self.elapsed
+    Only the iteration is timed; setting up each stream, e.g. constructing the tokenizer, happens beforehand.
+    """
+
+    list(make_tokens())
+
+    timings: list[float] = []
+    for _ in range(repeat):
+        tokens = make_tokens()
+        start = time.perf_counter_ns()
+        list(tokens)
+        timings.append((time.perf_counter_ns() - start) / 1e9)
+
+    return timings
+
+
+def summarize(timings: list[float]) -> str:
+    return f"min {min(timings):.6f}s, median {statistics.median(timings):.6f}s over {len(timings)} runs"
 
 
 def tokenizing_example() -> None:
@@ -26,14 +40,11 @@ def tokenizing_example() -> None:
         file_source = fp.read()
         file_name = fp.name
 
-    tokenizer = Tokenizer(file_source, file_name)
-
-    with TimeCatcher() as tc:
-        raw_tokens = list(tokenizer)
+    raw_tokens = list(Tokenizer(file_source, file_name))
 
     pprint(raw_tokens)
     print("=" * 40)
-    print(f"Time to tokenize: {tc.elapsed}")
+    print(f"Time to tokenize: {summarize(time_repeatedly(lambda: Tokenizer(file_source, file_name)))}")
 
     print("=" * 40)
     print("".join(t.value for t in raw_tokens))
@@ -45,25 +56,43 @@ def preprocessing_example() -> None:
         file_source = fp.read()
         file_name = fp.name
 
-    tokenizer = Tokenizer(file_source, file_name)
-    preprocessor = Preprocessor(tokenizer)
-    preprocessor.ignore_missing_includes = True
+    def make_preprocessor() -> Preprocessor:
+        preprocessor = Preprocessor(Tokenizer(file_source, file_name))
+        preprocessor.ignore_missing_includes = True
+        return preprocessor
 
-    with TimeCatcher() as tc:
-        post_pp_tokens = list(preprocessor)
+    post_pp_tokens = list(make_preprocessor())
 
     pprint(post_pp_tokens)
     print("=" * 40)
-    print(f"Time to tokenize + preprocess: {tc.elapsed}")
+    print(f"Time to tokenize + preprocess: {summarize(time_repeatedly(make_preprocessor))}")
 
     # print("=" * 40)
     # print(" ".join(t.value for t in post_pp_tokens))
     # print("\n")
 
 
+def scaling_example() -> None:
+    """Tokenize growing copies of the sample to check that throughput stays flat, i.e. that tokenizing is linear."""
+
+    with open("scripts/sample.c", encoding="utf-8") as fp:
+        file_source = fp.read()
+        file_name = fp.name
+
+    base_token_count = len(list(Tokenizer(file_source, file_name)))
+
+    print("=" * 40)
+    for scale in (1, 8, 64, 512):
+        scaled_source = file_source * scale
+        timings = time_repeatedly(lambda: Tokenizer(scaled_source, file_name), repeat=10)  # noqa: B023 # Called right away.
+        token_count = base_token_count * scale
+        print(f"x{scale}: {token_count} tokens, {token_count / statistics.median(timings):,.0f} tokens/s")
+
+
 def main() -> None:
     tokenizing_example()
     preprocessing_example()
+    scaling_example()
 
 
 if __name__ == "__main__":
@@ -73,19 +73,22 @@ _AUTO = object()
 
 _RESERVED_ENUM_NAMES = frozenset(("_generate_next_value_",))
 
+_PLAIN_VALUE_TYPES = (int, str, tuple)
+
 
 class _EnumMember:
     """Representation of an enum member."""
 
     # The class overall tries to preserve object identity for fast object comparison.
 
-    __slots__ = ("_cls", "_name_", "_value_")
+    __slots__ = ("_cls", "_name_", "_value_", "_hash_")
 
     _cls: type[Enum]
 
     def __init__(self, name: str, value: _t.Any) -> None:
         self._name_ = name
         self._value_ = value
+        self._hash_ = hash(name)
 
     @property
     def name(self) -> str:
@@ -109,10 +112,11 @@ class _EnumMember:
     def __hash__(self):
         """Hash the name of the member.
 
-        This matches the semantics of the ``enum`` module from the stdlib.
+        This matches the semantics of the ``enum`` module from the stdlib. The hash is computed once on creation since
+        members are often used as dict keys and set elements.
         """
 
-        return hash(self._name_)
+        return self._hash_
 
     # Could also use __getnewargs(_ex)__, but this was the simplest solution.
     def __reduce__(self):
@@ -153,6 +157,7 @@ class EnumMeta(type):
     _member_map_: dict[str, _EnumMember]
     _value2member_map_: dict[_t.Any, _EnumMember]
     _member_names_: list[str]
+    _proxied_member_map: MappingProxyType[str, _EnumMember]
 
     def __new__(cls, name: str, bases: tuple[type, ...], namespace: dict[str, _t.Any], /, **kwds: _t.Any):  # noqa: PLR0912
         """Convert class attributes to enum members."""
@@ -160,6 +165,7 @@ class EnumMeta(type):
         member_map: dict[str, _EnumMember] = {}
         value_map: dict[_t.Any, _EnumMember] = {}
         member_names: list[str] = []
+        member_values: list[_t.Any] = []
         last_auto = 0
 
         custom_auto = namespace.get("_generate_next_value_")
@@ -173,7 +179,10 @@ class EnumMeta(type):
 
         member_index = 0
         for ns_key, ns_value in list(namespace.items()):
-            is_descriptor = _is_descriptor(ns_value)
+            # Plain member values are never descriptors, so skip probing them for descriptor methods.
+            is_descriptor = (
+                (ns_value is not _AUTO) and (type(ns_value) not in _PLAIN_VALUE_TYPES) and _is_descriptor(ns_value)
+            )
 
             # Magic attributes (e.g. __name__, __qualname__) and private attributes.
             if ns_key.startswith("_") and not is_descriptor:
@@ -202,7 +211,7 @@ class EnumMeta(type):
                         ns_key,
                         1,  # No way to specify a different starting value.
                         member_index,
-                        [member._value_ for member in member_map.values()],
+                        member_values.copy(),  # Like the stdlib, give each call its own snapshot.
                     )
             elif isinstance(ns_value, int):
                 last_auto = ns_value
@@ -214,6 +223,7 @@ class EnumMeta(type):
                 member_names.append(ns_key)
 
             member_map[ns_key] = member
+            member_values.append(member._value_)
             namespace[ns_key] = member
 
             member_index += 1
@@ -221,6 +231,8 @@ class EnumMeta(type):
         namespace["_member_map_"] = member_map
         namespace["_value2member_map_"] = value_map
         namespace["_member_names_"] = member_names
+        # Create the proxy once to avoid rewrapping on every __members__ access.
+        namespace["_proxied_member_map"] = MappingProxyType(member_map)
 
         return super().__new__(cls, name, bases, namespace, **kwds)
 
@@ -234,12 +246,7 @@ class EnumMeta(type):
 
     @property
     def __members__(self) -> MappingProxyType[str, _t.Any]:
-        # Cache proxy to avoid rewrapping on every call.
-        try:
-            return self._proxied_member_map
-        except AttributeError:
-            self._proxied_member_map = members = MappingProxyType(self._member_map_)
-            return members
+        return self._proxied_member_map
 
     def __repr__(self) -> str:
         return f"<enum {self.__name__!r}>"
@@ -261,17 +268,24 @@ class EnumMeta(type):
     def __contains__(self, value: object, /) -> bool:
         """Check if the argument is a member or value of the enum."""
 
-        return self.__instancecheck__(value) or any(member._value_ == value for member in self)
+        # Same check as __instancecheck__, inlined since membership tests are common.
+        if getattr(value, "_cls", None) is self:
+            return True
+
+        try:
+            return value in self._value2member_map_
+        except TypeError:
+            # Unhashable values can still compare equal to a member's value.
+            return any(member._value_ == value for member in self._member_map_.values())
 
     def __iter__(self):
         """Iterate through the members."""
 
-        for name in self._member_names_:
-            yield self._member_map_[name]
+        # The value map holds each member once, without aliases, in definition order.
+        return iter(self._value2member_map_.values())
 
     def __reversed__(self):
-        for name in reversed(self._member_names_):
-            yield self._member_map_[name]
+        return reversed(self._value2member_map_.values())
 
     def __len__(self) -> int:
         return len(self._member_names_)
@@ -369,13 +383,18 @@ def unique(cls: type[Enum]) -> type[Enum]:
         If any duplicate values are found.
     """
 
-    seen: list[_t.Any] = []
+    # Aliases share a value map entry with the member they alias, so the maps only differ in size if there are any.
+    if len(cls._value2member_map_) == len(cls._member_map_):
+        return cls
+
+    # Values are keys of the value map, so they're hashable.
+    seen: set[_t.Any] = set()
     for member in cls._member_map_.values():
         value = member.value
         if value in seen:
             msg = f"duplicate values found in {cls!r}: {value!r}"
             raise ValueError(msg)
 
-        seen.append(value)
+        seen.add(value)
 
     return cls
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+
 from . import _typing_compat as _t
 from .token import Token
 
@@ -74,8 +76,15 @@ class PycpSyntaxError(PycpError):
 
     @classmethod
     def from_token(cls, msg: str, token: Token, /) -> _t.Self:
-        with open(token.filename) as fp:
-            line_text = next(line for i, line in enumerate(fp, start=1) if i == token.lineno)
+        # linecache keeps the lines of files it has read, so repeated errors and warnings (which also use it) for the
+        # same file don't have to read it again. It pulls in tokenize, so only import it once an error happens.
+        import linecache  # noqa: PLC0415 # Deferred import.
+
+        # Look up relative names from the working directory like open() would; linecache would search sys.path for them.
+        # Like tokenize_file(), pick up changes to the file instead of trusting the cached lines.
+        path = os.path.abspath(token.filename)
+        linecache.checkcache(path)
+        line_text = linecache.getline(path, token.lineno).rstrip("\r\n")
         return cls(msg, (token.filename, line_text, token.lineno, token.col_offset, token.end_col_offset))
 
 
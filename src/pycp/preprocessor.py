@@ -4,8 +4,7 @@ from __future__ import annotations
 
 import os
 import warnings
-from collections.abc import Generator, Iterable, Iterator
-from itertools import chain, takewhile, tee
+from collections.abc import Callable, Generator, Iterable, Iterator
 
 from . import _typing_compat as _t
 from .errors import PycpPreprocessorWarning, PycpSyntaxError, PycpSyntaxWarning
@@ -16,17 +15,8 @@ from .tokenizer import Tokenizer
 __all__ = ("Preprocessor", "Macro")
 
 
-_SPACE_TOKENS = {TokenKind.WS, TokenKind.COMMENT, TokenKind.ESCAPED_NL}
-
-
-def _is_not_space(tok: Token, /) -> bool:
-    """Check that the given token is not non-newline whitespace."""
-
-    return tok.kind not in _SPACE_TOKENS
-
-
-def _is_pp_directive_hash(curr_tok: Token, prev_tok: _t.Optional[Token], /) -> bool:
-    return (curr_tok.kind is TokenKind.PP_OCTO) and (prev_tok is None or prev_tok.kind is TokenKind.NL)
+# A tuple for the same reason as tokenizer._SPACE_TOKEN_KINDS.
+_SPACE_TOKENS = (TokenKind.WS, TokenKind.COMMENT, TokenKind.ESCAPED_NL)
 
 
 class Macro:
@@ -83,6 +73,97 @@ class Macro:
         return "".join(components)
 
 
+class _TokenStream:
+    """An iterator over a stack of token sources, where the most recently pushed source is consumed first.
+
+    Prepending to it doesn't wrap it in another layer, unlike itertools.chain, so the cost of getting the next token
+    doesn't grow with the number of includes and lookaheads.
+    """
+
+    __slots__ = ("_sources", "_exhaustion_callbacks")
+
+    def __init__(self, tokens: Iterable[Token]):
+        self._sources: list[Iterator[Token]] = [iter(tokens)]
+        # Sources with a callback for when they run out. A sub-stack of self._sources, since sources are only ever
+        # dropped from the top.
+        self._exhaustion_callbacks: list[tuple[Iterator[Token], Callable[[], object]]] = []
+
+    def __iter__(self) -> _t.Self:
+        return self
+
+    def __next__(self) -> Token:
+        sources = self._sources
+        while sources:
+            for tok in sources[-1]:
+                return tok
+
+            source = sources.pop()
+            callbacks = self._exhaustion_callbacks
+            if callbacks and (source is callbacks[-1][0]):
+                callbacks.pop()[1]()
+        raise StopIteration
+
+    def push_source(self, tokens: Iterable[Token], on_exhausted: _t.Optional[Callable[[], object]] = None) -> None:
+        """Add tokens to be consumed before the rest of the stream.
+
+        Parameters
+        ----------
+        tokens: Iterable[Token]
+            The tokens to add.
+        on_exhausted: Callable[[], object] | None, optional
+            A function to call once the tokens run out and are dropped from the stream. Defaults to None.
+        """
+
+        source = iter(tokens)
+        self._sources.append(source)
+        if on_exhausted is not None:
+            self._exhaustion_callbacks.append((source, on_exhausted))
+
+    def push_back(self, tok: Token) -> None:
+        """Put a single token back at the front of the stream."""
+
+        self._sources.append(iter((tok,)))
+
+    def next_non_space(self) -> _t.Optional[Token]:
+        """Consume tokens until one that isn't non-newline whitespace is found, then return it. If the stream runs out
+        first, return None.
+        """
+
+        for tok in self:
+            if tok.kind not in _SPACE_TOKENS:
+                return tok
+
+        return None
+
+    def peek(self, *, skip_spaces: bool = True) -> _t.Optional[Token]:
+        """Look at the next token without consuming it.
+
+        Parameters
+        ----------
+        skip_spaces: bool, default=True
+            Whether to find the next non-whitespace token. Newlines are not skipped regardless. True by default.
+        """
+
+        if not skip_spaces:
+            tok = next(self, None)
+            if tok is not None:
+                self.push_back(tok)
+            return tok
+
+        # Put everything consumed while looking ahead back at the front of the stream, whitespace included.
+        consumed: list[Token] = []
+        peek = None
+
+        for tok in self:
+            consumed.append(tok)
+            if tok.kind not in _SPACE_TOKENS:
+                peek = tok
+                break
+
+        self.push_source(consumed)
+        return peek
+
+
 class Preprocessor:
     """A preprocessor for the C language based on the C11 standard.
 
@@ -110,128 +191,123 @@ class Preprocessor:
         The macros defined during preprocessing.
     """
 
-    raw_tokens: Iterator[Token]
+    __slots__ = (
+        "raw_tokens",
+        "local_dir",
+        "include_search_dirs",
+        "ignore_missing_includes",
+        "macros",
+        "curr_tok",
+        "_at_line_start",
+        "_pragma_once_paths",
+        "_include_guarded_paths",
+        "_include_next_index",
+        "_include_path_cache",
+    )
+
+    raw_tokens: _TokenStream
     local_dir: str
     include_search_dirs: list[str]
     ignore_missing_includes: bool
     macros: dict[str, Macro]
 
+    #: The method handling each directive, bound per class so that overrides are used.
+    _directive_handlers: _t.ClassVar[dict[str, Callable[[Preprocessor], None]]]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._directive_handlers = _bind_directive_handlers(cls)
+
     def __init__(self, tokens: Iterable[Token], local_dir: str = ""):
-        self.raw_tokens = iter(tokens)
+        self.raw_tokens = _TokenStream(tokens)
         self.local_dir = local_dir
         self.include_search_dirs = []
         self.ignore_missing_includes = False
         self.macros = {}
 
-        #: The last seen token before the current one.
-        self._prev_tok: _t.Optional[Token] = None
+        #: Whether only whitespace has been seen since the last newline, i.e. whether a "#" would start a directive.
+        self._at_line_start: bool = True
         #: A set of files that guard inclusion via "#pragma once".
         self._pragma_once_paths: set[str] = set()
         #: A set of files that guard inclusion via the common "#ifndef" pattern.
         self._include_guarded_paths: set[str] = set()
         #: The index within include_search_dirs that the "#include_next" directive will start searching from.
         self._include_next_index: int = 0
+        #: Successful include path searches, to avoid repeating the same filesystem checks for every include.
+        self._include_path_cache: dict[tuple[str, str, tuple[str, ...]], tuple[str, _t.Optional[int]]] = {}
 
     def __iter__(self) -> _t.Self:
         return self
 
-    def __next__(self) -> Token:  # noqa: PLR0912
+    def __next__(self) -> Token:
         """Expand macros, evaluate preprocessor directives, and skip whitespace until a token is found that doesn't
         qualify for those operations. Return that.
         """
 
-        for self.curr_tok in self.raw_tokens:  # noqa: B020 # False positive.
-            if self._is_macro(self.curr_tok):
+        # Directive handlers only ever mutate the macro table, never replace it.
+        macros = self.macros
+
+        raw_tokens = self.raw_tokens
+
+        while (curr_tok := next(raw_tokens, None)) is not None:
+            self.curr_tok = curr_tok
+
+            # Inlined version of self._is_macro(), since this is checked for every token.
+            if (curr_tok.kind is TokenKind.ID) and (curr_tok.value in macros):
                 self._expand_macro()
 
-            elif _is_pp_directive_hash(self.curr_tok, self._prev_tok):
+            elif self._at_line_start and (curr_tok.kind is TokenKind.PP_OCTO):
                 # Invariant: Only the first token of a directive name should be consumed here.
                 # Handlers can internally forward as much as they wish.
                 # See "pragma once" for an example.
 
-                pp_start_tok = next(filter(_is_not_space, self.raw_tokens), None)
+                pp_start_tok = raw_tokens.next_non_space()
 
                 if pp_start_tok is None:
                     msg = "Missing preprocessor directive."
                     raise PycpSyntaxError.from_token(msg, self.curr_tok)
 
-                pp_start_value = pp_start_tok.value
-
-                if pp_start_tok.kind is TokenKind.NL:
-                    pass  # Null directive.
-
-                elif pp_start_value == "include":
-                    self.pp_include()
-
-                elif pp_start_value == "include_next":
-                    self.pp_include_next()
+                if pp_start_tok.kind is not TokenKind.NL:  # Null directive otherwise.
+                    directive_handler = self._directive_handlers.get(pp_start_tok.value)
 
-                elif pp_start_value == "pragma" and ((peek := self._peek()) is not None) and peek.value == "once":
-                    self.pp_pragma_once()
+                    if directive_handler is None:
+                        msg = "Invalid preprocessor directive."
+                        raise PycpSyntaxError.from_token(msg, pp_start_tok)
 
-                elif pp_start_value == "pragma":
-                    self.pp_pragma()
+                    directive_handler(self)
 
-                elif pp_start_value == "error":
-                    self.pp_error()
+                # Directives consume their line up to and including the newline.
+                self._at_line_start = True
 
-                elif pp_start_value == "warning":
-                    self.pp_warning()
-
-                else:
-                    msg = "Invalid preprocessor directive."
-                    raise PycpSyntaxError.from_token(msg, pp_start_tok)
-
-                self._prev_tok = self.curr_tok
-
-            elif self.curr_tok.kind in _SPACE_TOKENS:
-                self._prev_tok = self.curr_tok
+            elif curr_tok.kind in _SPACE_TOKENS:
+                # Whitespace doesn't change whether a "#" would be at the start of a line.
+                pass
 
             else:
-                self._prev_tok = self.curr_tok
-                return self.curr_tok
+                self._at_line_start = curr_tok.kind is TokenKind.NL
+                return curr_tok
 
         # Signal that the preprocessor is done after the end of the token stream.
         raise StopIteration
 
     # region ---- Internal helpers ----
 
-    def _peek(self, *, skip_spaces: bool = True) -> _t.Optional[Token]:
-        """Peek at the next token without consuming it.
-
-        Parameters
-        ----------
-        skip_spaces: bool, default=True
-            Whether to find the next non-whitespace token. Newlines are not skipped regardless. True by default.
-        """
-
-        self.raw_tokens, forked_tokens = tee(self.raw_tokens)
-        if skip_spaces:
-            return next(filter(_is_not_space, forked_tokens), None)
-        else:
-            return next(forked_tokens, None)
-
-    def _prepend(self, other_tokens: Iterable[Token]) -> None:
-        """Prepend an iterable of raw tokens to the internal token stream."""
-
-        self.raw_tokens = chain(other_tokens, self.raw_tokens)
-
     def _skip_rest_of_line(self) -> None:
         """Skip tokens until the next newline is found. Warn if any tokens are found.
 
         This is for directives that technically allow extra tokens after they are done but before the newline.
         """
 
-        next_tok = next(self.raw_tokens, None)
+        # Whitespace and comments before the newline aren't extra tokens.
+        next_tok = self.raw_tokens.next_non_space()
         if (next_tok is None) or (next_tok.kind is TokenKind.NL):
             return
 
         warnings.warn_explicit("Extra tokens.", PycpSyntaxWarning, next_tok.filename, next_tok.lineno)
 
-        # Preserve the newline for the pp hash check in __next__.
-        next_line_start = next((t for t in self.raw_tokens if t.kind is TokenKind.NL), None)
-        if next_line_start is not None:
-            self._prepend([next_line_start])
+        for tok in self.raw_tokens:
+            if tok.kind is TokenKind.NL:
+                break
 
     def _is_macro(self, tok: Token) -> bool:
         """Determine if a token corresponds to a defined macro."""
@@ -251,20 +327,27 @@ class Preprocessor:
 
         # Case 2: #include <foo.h>
         elif name_start_tok.kind is TokenKind.LT:
-            # Find the closing ">" before a newline.
-            _include_path_toks = list(takewhile(lambda t: t.kind is not TokenKind.NL, self.raw_tokens))
+            # Collect everything up to the closing ">", which has to come before a newline.
+            include_name_parts: list[str] = []
+            is_closed = False
+            for tok in self.raw_tokens:
+                if tok.kind is TokenKind.GT:
+                    is_closed = True
+                    break
+                if tok.kind is TokenKind.NL:
+                    break
+                include_name_parts.append(tok.value)
 
             # We could consume all the remaining tokens without finding ">", possibly without even hitting a newline.
-            if not _include_path_toks or (_include_path_toks[-1].kind is not TokenKind.GT):
+            if not is_closed:
                 msg = "Expected closing '>' for #include."
                 raise PycpSyntaxError.from_token(msg, name_start_tok)
 
-            # Remove the ">".
-            del _include_path_toks[-1]
-
-            parsed_include_name = "".join(t.value for t in _include_path_toks)
+            parsed_include_name = "".join(include_name_parts)
             is_quoted = False
 
+            self._skip_rest_of_line()
+
         # Case 3: #include FOO
         elif self._is_macro(name_start_tok):
             # TODO: Perform macro expansion, i.e. run through preprocessor and prepend to self.tokens. Then recurse?
@@ -297,46 +380,70 @@ class Preprocessor:
         if is_quoted:
             search_dirs = (self.local_dir, *self.include_search_dirs)
         else:
-            search_dirs = self.include_search_dirs
+            search_dirs = tuple(self.include_search_dirs)
+
+        # The search directories are part of the key so that changes to them are picked up.
+        cache_key = ("include", include_name, search_dirs)
+        try:
+            include_path, next_index = self._include_path_cache[cache_key]
+        except KeyError:
+            include_path, next_index = include_name, None
 
-        for i, include_dir in enumerate(search_dirs):
-            candidate = os.path.normpath(os.path.join(include_dir, include_name))
-            if os.path.exists(candidate):
-                self._include_next_index = i + 1
-                return candidate
+            for i, include_dir in enumerate(search_dirs):
+                candidate = os.path.normpath(os.path.join(include_dir, include_name))
+                if os.path.exists(candidate):
+                    include_path, next_index = candidate, i + 1
+                    # Only cache files that were found, so that ones created later (e.g. generated headers) still are.
+                    self._include_path_cache[cache_key] = (include_path, next_index)
+                    break
 
-        return include_name
+        if next_index is not None:
+            self._include_next_index = next_index
+
+        return include_path
 
     def _find_include_next_path(self, include_name: str) -> str:
-        for include_dir in self.include_search_dirs[self._include_next_index :]:
-            candidate = os.path.normpath(os.path.join(include_dir, include_name))
-            if os.path.exists(candidate):
-                return candidate
+        search_dirs = tuple(self.include_search_dirs[self._include_next_index :])
+
+        cache_key = ("include_next", include_name, search_dirs)
+        try:
+            include_path, _ = self._include_path_cache[cache_key]
+        except KeyError:
+            include_path = include_name
 
-        return include_name
+            for include_dir in search_dirs:
+                candidate = os.path.normpath(os.path.join(include_dir, include_name))
+                if os.path.exists(candidate):
+                    include_path = candidate
+                    self._include_path_cache[cache_key] = (include_path, None)
+                    break
 
-    def _tokens_with_temp_local_dir(self, include_path: str, include_source: str) -> Generator[Token]:
-        # TODO: There's no hook to replace the Tokenizer class with another one. Can one be provided? Should one?
+        return include_path
 
+    def _tokens_with_temp_local_dir(self, include_path: str, include_tokens: Iterator[Token]) -> Generator[Token]:
         _orig_local_dir = self.local_dir
         self.local_dir = os.path.dirname(include_path)
         try:
-            yield from Tokenizer(include_source, include_path)
+            yield from include_tokens
         finally:
             self.local_dir = _orig_local_dir
 
+    def _end_line(self) -> None:
+        self._at_line_start = True
+
     def _include_file(self, include_path: str, start_tok: Token) -> None:
         if not (include_path in self._pragma_once_paths or include_path in self._include_guarded_paths):
             try:
-                # TODO: Cache successfully read include paths to avoid future searches with tons of stat calls.
-                with open(include_path) as fp:
-                    include_source = fp.read()
+                # TODO: There's no hook to replace the Tokenizer class with another one. Can one be provided? Should one?
+                include_tokens = Tokenizer.tokenize_file(include_path)
             except OSError as exc:
                 if not self.ignore_missing_includes:
                     msg = f"Cannot open included file: {include_path!r}"
                     raise PycpSyntaxError.from_token(msg, start_tok) from exc
             else:
-                self._prepend(self._tokens_with_temp_local_dir(include_source, include_path))
+                # The end of an included file ends its last line, even if the file doesn't end with a newline.
+                include_source = self._tokens_with_temp_local_dir(include_path, include_tokens)
+                self.raw_tokens.push_source(include_source, self._end_line)
 
     # endregion ----
 
@@ -345,7 +452,11 @@ class Preprocessor:
     def pp_include(self) -> None:
         """#include directive: Include the file, preprocess it, then prepend its tokens to our tokens."""
 
-        include_name_start_tok = next(filter(_is_not_space, self.raw_tokens))
+        include_name_start_tok = self.raw_tokens.next_non_space()
+        if include_name_start_tok is None:
+            msg = "Expected filename after #include."
+            raise PycpSyntaxError.from_token(msg, self.curr_tok)
+
         include_name, is_quoted = self._read_include_name(include_name_start_tok)
         include_path = self._find_include_path(include_name, is_quoted=is_quoted)
         self._include_file(include_path, include_name_start_tok)
@@ -358,7 +469,11 @@ class Preprocessor:
         This is a *non-standard* directive.
         """
 
-        include_name_start_tok = next(filter(_is_not_space, self.raw_tokens))
+        include_name_start_tok = self.raw_tokens.next_non_space()
+        if include_name_start_tok is None:
+            msg = "Expected filename after #include."
+            raise PycpSyntaxError.from_token(msg, self.curr_tok)
+
         include_name, _ = self._read_include_name(include_name_start_tok)
         include_path = self._find_include_next_path(include_name)
         self._include_file(include_path, include_name_start_tok)
@@ -400,12 +515,18 @@ class Preprocessor:
         """
 
         # Forward to "once" since its presence is confirmed.
-        self.curr_tok = next(filter(_is_not_space, self.raw_tokens))
+        once_tok = self.raw_tokens.next_non_space()
+        assert once_tok is not None
+        self.curr_tok = once_tok
         self._pragma_once_paths.add(self.curr_tok.filename)
         self._skip_rest_of_line()
 
     def pp_pragma(self) -> None:
-        """#pragma directive: Ignore and skip to the next line."""
+        """#pragma directive: Ignore and skip to the next line, unless it's "#pragma once"."""
+
+        if ((peek := self.raw_tokens.peek()) is not None) and (peek.value == "once"):
+            self.pp_pragma_once()
+            return
 
         # TODO: Actually capture pragmas and put them in the AST somehow, but where?
 
@@ -420,9 +541,30 @@ class Preprocessor:
     def pp_warning(self) -> None:
         """#warning directive: Send a warning."""
 
-        if (peek := self._peek()) is not None and (peek.kind is TokenKind.STRING_LITERAL):
+        if (peek := self.raw_tokens.peek()) is not None and (peek.kind is TokenKind.STRING_LITERAL):
             warnings.warn_explicit(peek.value, PycpPreprocessorWarning, peek.filename, peek.lineno)
 
+            # Consume the message so that it isn't mistaken for extra tokens.
+            self.raw_tokens.next_non_space()
+
         self._skip_rest_of_line()
 
     # endregion ----
+
+
+_DIRECTIVE_HANDLER_NAMES = {
+    "include": "pp_include",
+    "include_next": "pp_include_next",
+    "pragma": "pp_pragma",
+    "error": "pp_error",
+    "warning": "pp_warning",
+}
+
+
+def _bind_directive_handlers(cls: type[Preprocessor]) -> dict[str, Callable[[Preprocessor], None]]:
+    """Look up the directive handlers on a preprocessor class, picking up any overridden methods."""
+
+    return {directive: getattr(cls, name) for directive, name in _DIRECTIVE_HANDLER_NAMES.items()}
+
+
+Preprocessor._directive_handlers = _bind_directive_handlers(Preprocessor)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
+
 
 TYPE_CHECKING = False
 
@@ -350,9 +352,10 @@ class Token:
 
     @property
     def end_lineno(self) -> int:
-        # FIXME: This doesn't match how a few things are handled in the tokenizer, e.g. block comments, line endings.
-
-        return self.lineno + self.value.count("\n")
+        # Count line breaks like the tokenizer does, i.e. "\r\n", "\r", and "\n". A break at the very end, as in newline
+        # and escaped newline tokens, finishes the token's last line instead of starting another one.
+        value = self.value.rstrip("\r\n")
+        return self.lineno + value.count("\n") + value.count("\r") - value.count("\r\n")
 
     def __repr__(self):
         return "".join(
@@ -387,6 +390,8 @@ class CharSets:
     punctuation2 = tuple(chars for chars in _PUNCTUATION_TOKEN_MAP if len(chars) == 2)
     punctuation3 = tuple(chars for chars in _PUNCTUATION_TOKEN_MAP if len(chars) == 3)
 
+    _identifier_start_singles = frozenset("_$\u00a8\u00aa\u00ad\u00af")
+
     _identifier_start_ranges = (
         ("\u00b2", "\u00b5"),
         ("\u00b7", "\u00ba"),
@@ -435,12 +440,20 @@ class CharSets:
         ("\U000e0000", "\U000efffd"),
     )
 
+    # The lower bounds of the (sorted, non-overlapping) ranges, for finding the only range a char could be in.
+    _identifier_start_lowers = tuple(lower for lower, _ in _identifier_start_ranges)
+
+    @staticmethod
+    def _in_ranges(char: str, lowers: tuple[str, ...], ranges: tuple[tuple[str, str], ...], /) -> bool:
+        index = bisect_right(lowers, char) - 1
+        return (index >= 0) and (char <= ranges[index][1])
+
     @classmethod
     def can_start_identifier(cls, char: str, /) -> bool:
         return (
             (char in cls.ascii_letters)
-            or (char in {"_", "$", "\u00a8", "\u00aa", "\u00ad", "\u00af"})
-            or any(lower <= char <= upper for lower, upper in cls._identifier_start_ranges)
+            or (char in cls._identifier_start_singles)
+            or cls._in_ranges(char, cls._identifier_start_lowers, cls._identifier_start_ranges)
         )
 
     _extra_identifier_end_ranges = (
@@ -449,11 +462,12 @@ class CharSets:
         ("\u20d0", "\u20ff"),
         ("\ufe20", "\ufe2f"),
     )
+    _extra_identifier_end_lowers = tuple(lower for lower, _ in _extra_identifier_end_ranges)
 
     @classmethod
     def can_end_identifier(cls, char: str, /) -> bool:
         return (
             cls.can_start_identifier(char)
             or char in cls.digits
-            or any(lower <= char <= upper for lower, upper in cls._extra_identifier_end_ranges)
+            or cls._in_ranges(char, cls._extra_identifier_end_lowers, cls._extra_identifier_end_ranges)
         )
@@ -2,19 +2,94 @@
 # - Could be faster and/or more memory efficient.
 #   - e.g. Token construction could avoid the overhead of string slicing by receiving memoryview instead.
 # - Might make inspection worse, which we don't want.
+# - Per-character indexing alone isn't a reason: CPython caches single-character latin-1 strings, so indexing into
+#   ASCII source doesn't allocate, and most scanning already happens inside re/str methods. Token values would also
+#   need decoding back to str, and non-ASCII identifiers would need a separate path.
 
 from __future__ import annotations
 
-from itertools import islice
+import os
+import re
+from collections.abc import Callable, Iterator
+from functools import lru_cache
 
 from . import _typing_compat as _t
 from .errors import PycpSyntaxError
-from .token import CharSets, Token, TokenKind
+from .token import _PUNCTUATION_TOKEN_MAP, CharSets, Token, TokenKind
 
 
 __all__ = ("Tokenizer",)
 
 
+_NEWLINE_PATTERN = re.compile(r"\r\n?|\n")
+
+
+def _build_identifier_continue_pattern() -> re.Pattern[str]:
+    """Build a pattern matching a run of characters that are valid after the start of an identifier.
+
+    The character class mirrors ``CharSets.can_end_identifier()``.
+    """
+
+    singles = sorted(CharSets.ascii_letters | CharSets.digits | CharSets._identifier_start_singles)
+    ranges = (*CharSets._identifier_start_ranges, *CharSets._extra_identifier_end_ranges)
+
+    char_class = "".join(
+        (
+            *(re.escape(char) for char in singles),
+            *(f"{re.escape(lower)}-{re.escape(upper)}" for lower, upper in ranges),
+        )
+    )
+    return re.compile(f"[{char_class}]*")
+
+
+_WHITESPACE_PATTERN = re.compile(r"[ \t]*")
+_IDENTIFIER_CONTINUE_PATTERN = _build_identifier_continue_pattern()
+# Most identifiers are pure ASCII, and a small character class is cheaper to match against.
+_ASCII_IDENTIFIER_CONTINUE_PATTERN = re.compile(r"[0-9A-Za-z_$]*")
+_NUMERIC_CONTINUE_PATTERN = re.compile(r"(?:[eEpP][+-]|[0-9A-Za-z.])*")
+_QUOTE_CONTENTS_PATTERNS = {
+    quote_char: re.compile(rf"(?:[^{quote_char}\\\r\n]|\\(?:\r\n|.))*", re.DOTALL) for quote_char in ("'", '"')
+}
+
+
+def _group_punctuators_by_first_char() -> dict[str, tuple[tuple[str, TokenKind], ...]]:
+    """Group the punctuators and their token kinds by first character, ordered from longest to shortest."""
+
+    groups: dict[str, list[tuple[str, TokenKind]]] = {}
+    for punctuator, tok_kind in sorted(_PUNCTUATION_TOKEN_MAP.items(), key=lambda item: -len(item[0])):
+        groups.setdefault(punctuator[0], []).append((punctuator, tok_kind))
+    return {first_char: tuple(group) for first_char, group in groups.items()}
+
+
+_PUNCTUATORS_BY_FIRST_CHAR = _group_punctuators_by_first_char()
+
+# A tuple instead of a set: membership checks compare by identity first, while hashing members is comparatively slow.
+_SPACE_TOKEN_KINDS = (TokenKind.WS, TokenKind.COMMENT, TokenKind.ESCAPED_NL)
+# Kinds of tokens that can contain newlines, i.e. block comments, escaped newlines, and quotes with escaped newlines.
+_MULTILINE_TOKEN_KINDS = (TokenKind.COMMENT, TokenKind.ESCAPED_NL, TokenKind.STRING_LITERAL, TokenKind.CHAR_CONST)
+
+# Token values from a small, fixed vocabulary that repeat constantly. Every tokenizer starts out with these interned,
+# so tokens from different files share them too.
+_CANONICAL_VALUES = {value: value for value in (*_PUNCTUATION_TOKEN_MAP, "\n", "\r\n", "\r", " ", "\t")}
+
+
+@lru_cache(maxsize=256)
+def _tokenize_file_cached(cls: type[Tokenizer], path: str, mtime_ns: int, size: int) -> tuple[Token, ...]:
+    """Read and tokenize a file with the given tokenizer class.
+
+    The modification time and size only exist to invalidate stale cache entries.
+    """
+
+    # Read the raw bytes in one go: this skips the buffered text I/O stack, and it keeps newlines as they are in the
+    # file instead of translating them, so that tokens round-trip like they do for in-memory sources.
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+    return tuple(cls(data.decode("utf-8"), path))
+
+
 class Tokenizer:
     """A tokenizer for the C language based on the C11 standard.
 
@@ -26,6 +101,9 @@ class Tokenizer:
         The string to tokenize.
     filename: str, default="<unknown>"
         The name of the file the string came from.
+    skip_spaces: bool, default=False
+        Whether to skip non-newline whitespace, i.e. spaces, tabs, comments, and escaped newlines, instead of producing
+        tokens for it. Defaults to False.
 
     Attributes
     ----------
@@ -41,6 +119,8 @@ class Tokenizer:
         The length of the entire source (after modification).
     lineno: int
         The line number currently being parsed of the source. Starts at 1.
+    skip_spaces: bool
+        Whether non-newline whitespace is skipped instead of being produced as tokens.
 
     Notes
     -----
@@ -61,104 +141,133 @@ class Tokenizer:
         - [] Digraphs and trigraphs (optional).
     """
 
+    __slots__ = (
+        "source",
+        "filename",
+        "previous",
+        "current",
+        "end",
+        "lineno",
+        "skip_spaces",
+        "_current_line_start",
+        "_interned_values",
+    )
+
     source: str
     filename: str
     previous: int
     current: int
     end: int
     lineno: int
+    skip_spaces: bool
 
-    def __init__(self, source: str, filename: str = "<unknown>"):
+    #: The method handling each ASCII character that can start a token, bound per class so that overrides are used.
+    _first_char_handlers: _t.ClassVar[dict[str, Callable[[Tokenizer], TokenKind]]]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._first_char_handlers = _bind_first_char_handlers(cls)
+
+    def __init__(self, source: str, filename: str = "<unknown>", *, skip_spaces: bool = False):
         self.source = source
         self.filename = filename
         self.previous = 0
         self.current = 0
         self.end = len(self.source)
         self.lineno = 1
+        self.skip_spaces = skip_spaces
 
-        #: The index of the first character of the current line.
+        #: The index of the first character of the current physical line.
         self._current_line_start: int = 0
-
-    @property
-    def curr_char(self) -> str:
-        """`str`: The character at the current index in the text."""
-
-        return self.source[self.current]
+        #: Previously seen token values, so that repeated identifiers, numbers, etc. share one string.
+        self._interned_values: dict[str, str] = dict(_CANONICAL_VALUES)
 
     def __repr__(self):
         return f"{self.__class__.__name__}(filename={self.filename!r}, current={self.current!r})"
 
-    def __iter__(self) -> _t.Self:
-        return self
+    @classmethod
+    def tokenize_file(cls, path: str) -> Iterator[Token]:
+        """Tokenize the file at the given path, reusing earlier results if the file hasn't changed since.
 
-    def __next__(self) -> Token:  # noqa: PLR0912
-        # Signal that the tokenizer is done after the end of the source code.
-        if self.current >= self.end:
-            raise StopIteration
+        Files are considered unchanged if their modification time and size are the same. This mostly helps with
+        headers that get included many times. Results are kept per tokenizer class, so subclasses get their own tokens.
 
-        # Get the token kind and set the start and end positions of the next token.
-        curr_char = self.curr_char
+        Parameters
+        ----------
+        path: str
+            The path of the file to tokenize. Its absolute form is used as the filename of the tokens, so that
+            different spellings of the same path share results.
 
-        if self.source.startswith("//", self.current):
-            tok_kind = self.line_comment()
+        Returns
+        -------
+        Iterator[Token]
+            An iterator over the file's tokens. The tokens may be shared with other callers and shouldn't be modified.
 
-        elif self.source.startswith("/*", self.current):
-            tok_kind = self.block_comment()
+        Raises
+        ------
+        OSError
+            If the file can't be accessed.
+        """
 
-        elif self.source.startswith(("\\\r", "\\\n"), self.current):
-            tok_kind = self.escaped_newline()
+        path = os.path.abspath(path)
+        stat_result = os.stat(path)
+        return iter(_tokenize_file_cached(cls, path, stat_result.st_mtime_ns, stat_result.st_size))
 
-        elif curr_char in "\r\n":
-            tok_kind = self.newline()
+    def __iter__(self) -> _t.Self:
+        return self
 
-        elif curr_char in CharSets.non_nl_whitespace:
-            tok_kind = self.whitespace()
+    def __next__(self) -> Token:
+        source = self.source
+        first_char_handlers = self._first_char_handlers
 
-        elif curr_char.isdecimal() or (curr_char == "." and ((peek := self._peek()) is not None) and peek.isdecimal()):
-            tok_kind = self.numeric_literal()
+        while True:
+            # Signal that the tokenizer is done after the end of the source code.
+            if self.current >= self.end:
+                raise StopIteration
 
-        elif self.source.startswith(('"', 'u8"', 'u"', 'L"', 'W"'), self.current):
-            tok_kind = self.string_literal()
+            # Get the token kind and set the start and end positions of the next token. Most characters determine the
+            # handler on their own; the rest are either identifier starters outside ASCII or invalid.
+            curr_char = source[self.current]
+            handler = first_char_handlers.get(curr_char)
 
-        elif self.source.startswith(("'", "u'", "L'", "U'"), self.current):
-            tok_kind = self.char_const()
+            if handler is not None:
+                tok_kind = handler(self)
 
-        elif CharSets.can_start_identifier(curr_char):
-            tok_kind = self.identifier()
+            elif CharSets.can_start_identifier(curr_char):
+                tok_kind = self.identifier()
 
-        elif curr_char in CharSets.punctuation1:
-            # Some punctuators overlap with different lengths. Verify the exact one.
-            tok_kind = self.punctuation()
+            else:
+                msg = "Invalid token."
+                raise PycpSyntaxError(msg, self._get_current_location())
 
-        else:
-            msg = "Invalid token."
-            raise PycpSyntaxError(msg, self._get_current_location())
+            # Move past non-newline whitespace without constructing a token for it if it's being skipped.
+            if not (self.skip_spaces and (tok_kind in _SPACE_TOKEN_KINDS)):
+                break
+
+            self._track_newlines_within_token()
+            self.previous = self.current
 
         # Construct the token.
-        tok_value = self.source[self.previous : self.current]
+        tok_value = source[self.previous : self.current]
+        if (tok_kind is not TokenKind.COMMENT) and (tok_kind is not TokenKind.STRING_LITERAL):
+            tok_value = self._interned_values.setdefault(tok_value, tok_value)
         col_offset, end_col_offset = self._get_current_offset()
         tok = Token(tok_kind, tok_value, self.lineno, col_offset, end_col_offset, self.filename)
 
         # Update position trackers.
-        self.previous = self.current
-
         if tok_kind is TokenKind.NL:
             self.lineno += 1
             self._current_line_start = self.current
+        elif tok_kind in _MULTILINE_TOKEN_KINDS:
+            self._track_newlines_within_token()
+
+        self.previous = self.current
 
         # Return the token.
         return tok
 
     # region ---- Internal helpers ----
 
-    def _peek(self) -> _t.Optional[str]:
-        """Return the next character in the source if it exists. Otherwise, return None."""
-
-        if (self.current + 1) < self.end:
-            return self.source[self.current + 1]
-        else:
-            return None
-
     def _get_current_offset(self) -> tuple[int, int]:
         """Get the start and end offset of the current potential token relative to start of the current line."""
 
@@ -177,41 +286,87 @@ class Tokenizer:
             A tuple with the filename, line text, line number, column offset, and end column offset.
         """
 
-        # TODO: This probably won't work if/when line continuations are kept around.
-        line_text = self.source.splitlines()[self.lineno - 1]
+        # The running line tracking always points at the physical line containing the start of the token.
+        line_start = self._current_line_start
+        line_end_match = _NEWLINE_PATTERN.search(self.source, line_start)
+        line_end = line_end_match.start() if (line_end_match is not None) else self.end
+        line_text = self.source[line_start:line_end]
 
         col_offset, end_col_offset = self._get_current_offset()
         return (self.filename, line_text, self.lineno, col_offset, end_col_offset)
 
+    def _track_newlines_within_token(self) -> None:
+        """Move the line tracking past any newlines inside the current token, e.g. in a block comment."""
+
+        source, start, end = self.source, self.previous, self.current
+
+        last_newline = max(source.rfind("\n", start, end), source.rfind("\r", start, end))
+        if last_newline != -1:
+            # "\r\n" counts as one newline, not two.
+            newline_count = source.count("\n", start, end) + source.count("\r", start, end)
+            newline_count -= source.count("\r\n", start, end)
+
+            self.lineno += newline_count
+            self._current_line_start = last_newline + 1
+
+    def _comment_or_punctuation(self) -> TokenKind:
+        """Handle a token starting with "/"."""
+
+        if self.source.startswith("//", self.current):
+            return self.line_comment()
+        elif self.source.startswith("/*", self.current):
+            return self.block_comment()
+        else:
+            return self.punctuation()
+
+    def _escaped_newline_or_punctuation(self) -> TokenKind:
+        """Handle a token starting with "\\"."""
+
+        if self.source.startswith(("\\\r", "\\\n"), self.current):
+            return self.escaped_newline()
+        else:
+            return self.punctuation()
+
+    def _numeric_literal_or_punctuation(self) -> TokenKind:
+        """Handle a token starting with ".", which might be a number with no integer part."""
+
+        # The slice is empty at the end of the source, which compares less than "0".
+        next_char = self.source[self.current + 1 : self.current + 2]
+        if "0" <= next_char <= "9":
+            return self.numeric_literal()
+        else:
+            return self.punctuation()
+
+    def _prefixed_literal_or_identifier(self) -> TokenKind:
+        """Handle a token starting with a character that can prefix a string literal or char const."""
+
+        if self.source.startswith(('u8"', 'u"', 'L"', 'W"'), self.current):
+            return self.string_literal()
+        elif self.source.startswith(("u'", "L'", "U'"), self.current):
+            return self.char_const()
+        else:
+            return self.identifier()
+
     def _find_quote_end(self) -> None:
         """Find the end of a quote-bounded section and set the index to it."""
 
         # Precondition: The index points to the starting quote character.
-        quote_start = self.current
-        quote_char = self.curr_char
-        quote_type = "char const" if (quote_char == "'") else "string literal"
+        quote_char = self.source[self.current]
 
-        # Find the end of the quote. Ignore escaped quote characters.
-        quote_end = self.current + 1
-        try:
-            while True:
-                quote_end = self.source.index(quote_char, quote_end, self.end)
-                if self.source[quote_end - 1] != "\\":
-                    self.current = quote_end + 1
-                    break
-                quote_end += 1
-        except ValueError:  # Raised by index when not found.
-            msg = f"Unclosed {quote_type}."
-            raise PycpSyntaxError(msg, self._get_current_location()) from None
+        # Find the end of the quote's contents in one pass. Escape sequences, including escaped quote characters and
+        # escaped newlines, are consumed whole; unescaped newlines end the match.
+        match = _QUOTE_CONTENTS_PATTERNS[quote_char].match(self.source, self.current + 1)
+        assert match is not None  # The pattern can match an empty string.
+        self.current = match.end()
 
-        # Ensure the quote is entirely on one logical line, i.e. that it doesn't contain any unescaped newlines.
-        if any(
-            (char == "\r" and self.source[i - 1] != "\\") or (char == "\n" and self.source[i - 1] not in "\\\r")
-            for i, char in enumerate(islice(self.source, quote_start, self.current), start=quote_start)
-        ):
+        # Ensure the quote is closed on the same logical line.
+        if not self.source.startswith(quote_char, self.current):
+            quote_type = "char const" if (quote_char == "'") else "string literal"
             msg = f"Unclosed {quote_type}."
             raise PycpSyntaxError(msg, self._get_current_location())
 
+        self.current += 1
+
     # endregion ----
 
     # region ---- Token position handlers ----
@@ -220,8 +375,14 @@ class Tokenizer:
         """Handle a line comment, which starts with "//"."""
 
         self.current += 2
-        potential_ends = (self.source.find("\r", self.current), self.source.find("\n", self.current), self.end)
-        self.current = min(i for i in potential_ends if i != -1)
+
+        # The comment ends at the first "\r" or "\n". Only search for "\r" up to the first "\n".
+        comment_end = self.source.find("\n", self.current)
+        if comment_end == -1:
+            comment_end = self.end
+
+        cr_index = self.source.find("\r", self.current, comment_end)
+        self.current = cr_index if (cr_index != -1) else comment_end
         return TokenKind.COMMENT
 
     def block_comment(self) -> _t.Literal[TokenKind.COMMENT]:
@@ -243,11 +404,7 @@ class Tokenizer:
         """Handle a newline. A newline can be "\\n", "\\r\\n", or "\\r"."""
 
         # Account for DOS-style line endings.
-        if self.curr_char == "\r":
-            self.current += 1
-
-        if self.curr_char == "\n":
-            self.current += 1
+        self.current += 2 if self.source.startswith("\r\n", self.current) else 1
 
         return TokenKind.NL
 
@@ -261,62 +418,51 @@ class Tokenizer:
     def whitespace(self) -> _t.Literal[TokenKind.WS]:
         """Handle unimportant whitespace."""
 
-        self.current += 1
-
         # Get the index of the next non-whitespace character.
-        self.current = next(
-            (i for i in range(self.current, self.end) if self.source[i] not in CharSets.non_nl_whitespace),
-            self.current,
-        )
+        match = _WHITESPACE_PATTERN.match(self.source, self.current + 1)
+        assert match is not None  # The pattern can match an empty string.
+        self.current = match.end()
 
         return TokenKind.WS
 
     def numeric_literal(self) -> _t.Literal[TokenKind.PP_NUM]:
         """Handle a somewhat relaxed numeric literal. These will be replaced during preprocessing."""
 
-        self.current += 1
-
-        while self.current < self.end:
-            if self.curr_char in "eEpP" and ((peek := self._peek()) is not None) and peek in "+-":
-                self.current += 2
-            elif self.curr_char in CharSets.alphanumeric or self.curr_char == ".":
-                self.current += 1
-            else:
-                break
+        # A sign can only be part of the literal if it directly follows an exponent character.
+        match = _NUMERIC_CONTINUE_PATTERN.match(self.source, self.current + 1)
+        assert match is not None  # The pattern can match an empty string.
+        self.current = match.end()
 
         return TokenKind.PP_NUM
 
     def identifier(self) -> _t.Literal[TokenKind.ID]:
         """Handle an identifier/keyword."""
 
-        self.current += 1
+        # Get the index of the next character that isn't valid as part of an identifier. Only fall back to the full
+        # character class if the ASCII run stops at a non-ASCII character.
+        match = _ASCII_IDENTIFIER_CONTINUE_PATTERN.match(self.source, self.current + 1)
+        assert match is not None  # The pattern can match an empty string.
+        self.current = match.end()
 
-        # Get the index of the next character that isn't valid as part of an identifier.
-        self.current = next(
-            (i for i in range(self.current, self.end) if not CharSets.can_end_identifier(self.source[i])),
-            self.current,
-        )
+        if (self.current < self.end) and (self.source[self.current] > "\x7f"):
+            match = _IDENTIFIER_CONTINUE_PATTERN.match(self.source, self.current)
+            assert match is not None  # The pattern can match an empty string.
+            self.current = match.end()
 
         return TokenKind.ID
 
     def punctuation(self) -> TokenKind:
         """Handle a punctuator."""
 
-        # We have to increment by the exact length of the identifier, so we check the longest ones first.
-        if self.source.startswith(CharSets.punctuation3, self.current):
-            self.current += 3
-        elif self.source.startswith(CharSets.punctuation2, self.current):
-            self.current += 2
-        else:
-            self.current += 1
+        # Punctuators can overlap with different lengths, so candidates are ordered from longest to shortest.
+        for punctuator, tok_kind in _PUNCTUATORS_BY_FIRST_CHAR.get(self.source[self.current], ()):
+            if self.source.startswith(punctuator, self.current):
+                self.current += len(punctuator)
+                return tok_kind
 
-        try:
-            tok_kind = TokenKind.from_punctuator(self.source[self.previous : self.current])
-        except ValueError:
-            msg = "Invalid punctuation."
-            raise PycpSyntaxError(msg, self._get_current_location()) from None
-        else:
-            return tok_kind
+        self.current += 1
+        msg = "Invalid punctuation."
+        raise PycpSyntaxError(msg, self._get_current_location())
 
     def string_literal(self) -> _t.Literal[TokenKind.STRING_LITERAL]:
         """Handle a string literal, which can be utf-8, utf-16, wide, or utf-32."""
@@ -324,7 +470,7 @@ class Tokenizer:
         # Move past the prefix so that the quote starter is the current character.
         if self.source.startswith("u8", self.current):
             self.current += 2
-        elif self.curr_char in "uLW":
+        elif self.source[self.current] in "uLW":
             self.current += 1
 
         self._find_quote_end()
@@ -335,7 +481,7 @@ class Tokenizer:
         """Handle a character constant, which can be utf-8, utf-16, wide, or utf-32."""
 
         # Move past the prefix so that the quote starter is the current character.
-        if self.curr_char in "uLU":
+        if self.source[self.current] in "uLU":
             self.current += 1
 
         self._find_quote_end()
@@ -343,3 +489,39 @@ class Tokenizer:
         return TokenKind.CHAR_CONST
 
     # endregion ----
+
+
+def _build_first_char_handler_names() -> dict[str, str]:
+    """Map each ASCII character that can start a token to the name of the tokenizer method that handles it.
+
+    Characters shared by several kinds of tokens map to a method that picks between them.
+    """
+
+    handler_names: dict[str, str] = {}
+
+    # Later assignments take precedence.
+    handler_names.update(dict.fromkeys(CharSets.punctuation1, "punctuation"))
+    handler_names.update(dict.fromkeys(CharSets.ascii_letters | {"_", "$"}, "identifier"))
+    handler_names.update(dict.fromkeys(CharSets.digits, "numeric_literal"))
+    handler_names.update(dict.fromkeys(CharSets.non_nl_whitespace, "whitespace"))
+    handler_names.update(dict.fromkeys("\r\n", "newline"))
+    handler_names.update(dict.fromkeys("uLUW", "_prefixed_literal_or_identifier"))
+    handler_names['"'] = "string_literal"
+    handler_names["'"] = "char_const"
+    handler_names["/"] = "_comment_or_punctuation"
+    handler_names["\\"] = "_escaped_newline_or_punctuation"
+    handler_names["."] = "_numeric_literal_or_punctuation"
+
+    return handler_names
+
+
+_FIRST_CHAR_HANDLER_NAMES = _build_first_char_handler_names()
+
+
+def _bind_first_char_handlers(cls: type[Tokenizer]) -> dict[str, Callable[[Tokenizer], TokenKind]]:
+    """Look up the first-character handlers on a tokenizer class, picking up any overridden methods."""
+
+    return {char: getattr(cls, name) for char, name in _FIRST_CHAR_HANDLER_NAMES.items()}
+
+
+Tokenizer._first_char_handlers = _bind_first_char_handlers(Tokenizer)
@@ -64,8 +64,7 @@ class TestCreate:
 
     def test_member_order(self, create):
         enum_ = create("test_member_order", ["v1", "v2", "v3"])
-        for value in range(1, 4):
-            assert getattr(enum_, f"v{value}").value == value
+        assert [(member.name, member.value) for member in enum_] == [("v1", 1), ("v2", 2), ("v3", 3)]
 
     @pytest.mark.parametrize("separator", [" ", ",", ", "])
     def test_str_names(self, create, separator):
@@ -172,7 +171,7 @@ class TestClass:
             v2 = 2
             v3 = 3
 
-        assert Enum.__members__ == {"v1": Enum.v1, "v2": Enum.v2, "v3": Enum.v3}
+        assert list(Enum.__members__.items()) == [("v1", Enum.v1), ("v2", Enum.v2), ("v3", Enum.v3)]
 
     def test_isinstance(self, module):
         class Enum(module.Enum):
@@ -190,6 +189,16 @@ class TestClass:
 
         assert list(Enum) == [Enum.v1, Enum.v2, Enum.v3]
 
+    def test_iter_skips_aliases(self, module):
+        class Enum(module.Enum):
+            v1 = 1
+            v2 = 2
+            alias = 1
+
+        assert Enum.alias is Enum.v1
+        assert list(Enum) == [Enum.v1, Enum.v2]  # pyright: ignore[reportArgumentType]
+        assert list(reversed(Enum)) == [Enum.v2, Enum.v1]  # pyright: ignore[reportArgumentType, reportCallIssue]
+
     def test_call_success(self, module):
         class Enum1(module.Enum):
             member = 42
@@ -247,6 +256,16 @@ class TestBasicEnumClass:
         assert Enum.v2.value == "5"
         assert Enum.v3.value == 2
 
+    def test_contains_value(self):
+        """Test checking for member values, which stdlib enum only allows since Python 3.12."""
+
+        class Enum(internal_enum.Enum):
+            member = 42
+
+        assert 42 in Enum
+        assert 43 not in Enum
+        assert [42] not in Enum
+
 
 class StdlibEnum(enum.Enum):
     v1 = enum.auto()
@@ -0,0 +1,217 @@
+# pyright: basic
+
+"""Tests for the preprocessor."""
+
+import warnings
+
+import pytest
+
+from pycp.errors import PycpPreprocessorWarning, PycpSyntaxError, PycpSyntaxWarning
+from pycp.preprocessor import Preprocessor, _TokenStream
+from pycp.token import TokenKind
+from pycp.tokenizer import Tokenizer
+
+
+def _preprocess(path) -> list[str]:
+    preprocessor = Preprocessor(Tokenizer(path.read_text(), str(path)), str(path.parent))
+    return [tok.value for tok in preprocessor]
+
+
+def test_include(tmp_path):
+    (tmp_path / "header.h").write_text("int x;\n")
+    main_path = tmp_path / "main.c"
+    main_path.write_text('#include "header.h"\nint y;\n')
+
+    assert _preprocess(main_path) == ["int", "x", ";", "\n", "int", "y", ";", "\n"]
+
+
+def test_warning(tmp_path):
+    main_path = tmp_path / "main.c"
+    main_path.write_text('#warning "careful"\nint y;\n')
+
+    with pytest.warns(PycpPreprocessorWarning, match="careful"):
+        assert _preprocess(main_path) == ["int", "y", ";", "\n"]
+
+
+def test_subclass_directive_override():
+    class LenientPreprocessor(Preprocessor):
+        def pp_error(self) -> None:
+            for tok in self.raw_tokens:
+                if tok.kind is TokenKind.NL:
+                    break
+
+    preprocessor = LenientPreprocessor(Tokenizer('#error "nope"\nint y;\n'))
+    assert [tok.value for tok in preprocessor] == ["int", "y", ";", "\n"]
+
+
+def test_error_location(tmp_path):
+    main_path = tmp_path / "main.c"
+    main_path.write_text("int a;\n#bogus\n")
+
+    with pytest.raises(PycpSyntaxError) as exc_info:
+        _preprocess(main_path)
+
+    exc = exc_info.value
+    assert (exc.text, exc.lineno, exc.offset, exc.end_offset) == ("#bogus", 2, 1, 6)
+
+
+def test_error_location_after_file_changes(tmp_path):
+    main_path = tmp_path / "main.c"
+    main_path.write_text("int a;\n#bogus\n")
+
+    with pytest.raises(PycpSyntaxError) as exc_info:
+        _preprocess(main_path)
+    assert exc_info.value.text == "#bogus"
+
+    main_path.write_text("int b;\n#xx\n")
+
+    with pytest.raises(PycpSyntaxError) as exc_info:
+        _preprocess(main_path)
+    assert (exc_info.value.text, exc_info.value.lineno) == ("#xx", 2)
+
+
+def test_error_location_relative_filename(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "main.c").write_text("#bogus\n")
+
+    with pytest.raises(PycpSyntaxError) as exc_info:
+        list(Preprocessor(Tokenizer("#bogus\n", "main.c")))
+    assert exc_info.value.text == "#bogus"
+
+    # A missing file shouldn't be looked up on sys.path, where a module of the same name exists.
+    with pytest.raises(PycpSyntaxError) as exc_info:
+        list(Preprocessor(Tokenizer("#bogus\n", "os.py")))
+    assert (exc_info.value.filename, exc_info.value.text) == ("os.py", "")
+
+
+def test_include_created_after_missing(tmp_path):
+    main_path = tmp_path / "main.c"
+    main_path.write_text('#include "gen.h"\nint y;\n')
+
+    preprocessor = Preprocessor(Tokenizer(main_path.read_text(), str(main_path)), str(tmp_path))
+    preprocessor.ignore_missing_includes = True
+    assert [tok.value for tok in preprocessor] == ["int", "y", ";", "\n"]
+
+    (tmp_path / "gen.h").write_text("int x;\n")
+    preprocessor.raw_tokens.push_source(Tokenizer(main_path.read_text(), str(main_path)))
+    assert [tok.value for tok in preprocessor] == ["int", "x", ";", "\n", "int", "y", ";", "\n"]
+
+
+def test_include_angle_brackets(tmp_path):
+    (tmp_path / "sys").mkdir()
+    (tmp_path / "sys" / "header.h").write_text("int x;\n")
+    main_path = tmp_path / "main.c"
+    main_path.write_text("#include <sys/header.h>\nint y;\n")
+
+    preprocessor = Preprocessor(Tokenizer(main_path.read_text(), str(main_path)))
+    preprocessor.include_search_dirs.append(str(tmp_path))
+    assert [tok.value for tok in preprocessor] == ["int", "x", ";", "\n", "int", "y", ";", "\n"]
+
+
+def test_include_angle_brackets_unclosed(tmp_path):
+    main_path = tmp_path / "main.c"
+    main_path.write_text("#include <header.h\nint y;\n")
+
+    with pytest.raises(PycpSyntaxError, match="Expected closing '>'"):
+        _preprocess(main_path)
+
+
+def test_consecutive_directives(tmp_path):
+    (tmp_path / "a.h").write_text('#include "b.h"\nint a;\n')
+    (tmp_path / "b.h").write_text("int b;\n")
+    main_path = tmp_path / "main.c"
+    main_path.write_text('#include "a.h"\n  #include "b.h"\nint c;\n')
+
+    assert _preprocess(main_path) == [
+        "int",
+        "b",
+        ";",
+        "\n",
+        "int",
+        "a",
+        ";",
+        "\n",
+        "int",
+        "b",
+        ";",
+        "\n",
+        "int",
+        "c",
+        ";",
+        "\n",
+    ]
+
+
+def test_pragma_once(tmp_path):
+    (tmp_path / "header.h").write_text("#pragma once\nint x;\n")
+    main_path = tmp_path / "main.c"
+    main_path.write_text('#include "header.h"\n#include "header.h"\nint y;\n')
+
+    assert _preprocess(main_path) == ["int", "x", ";", "\n", "int", "y", ";", "\n"]
+
+
+def test_extra_tokens_after_directive(tmp_path):
+    (tmp_path / "header.h").write_text("int x;\n")
+    main_path = tmp_path / "main.c"
+    main_path.write_text('#include "header.h" extra\n#include "header.h"\n')
+
+    with pytest.warns(PycpSyntaxWarning, match="Extra tokens"):
+        assert _preprocess(main_path) == ["int", "x", ";", "\n", "int", "x", ";", "\n"]
+
+
+def test_token_stream():
+    stream = _TokenStream(Tokenizer("a /* b */ c\nd"))
+
+    tok = stream.peek(skip_spaces=False)
+    assert tok is not None
+    assert tok.value == "a"
+
+    tok = stream.next_non_space()
+    assert tok is not None
+    assert tok.value == "a"
+
+    tok = stream.peek()
+    assert tok is not None
+    assert tok.value == "c"
+
+    stream.push_source(Tokenizer("x y"))
+    stream.push_back(next(stream))
+    assert [tok.value for tok in stream] == ["x", " ", "y", " ", "/* b */", " ", "c", "\n", "d"]
+    assert stream.peek() is None
+
+
+def test_token_stream_exhaustion_callback():
+    ended: list[str] = []
+    stream = _TokenStream(Tokenizer("a"))
+    stream.push_source(Tokenizer("b"), lambda: ended.append("b"))
+
+    stream.push_back(next(stream))
+    assert next(stream).value == "b"
+    assert ended == []
+
+    assert next(stream).value == "a"
+    assert ended == ["b"]
+
+
+def test_directive_after_include_without_trailing_newline(tmp_path):
+    (tmp_path / "nonl.h").write_text("int x;")
+    (tmp_path / "h.h").write_text("int z;\n")
+    main_path = tmp_path / "main.c"
+    main_path.write_text('#include "nonl.h"\n#include "h.h"\nint y;\n')
+
+    assert _preprocess(main_path) == ["int", "x", ";", "int", "z", ";", "\n", "int", "y", ";", "\n"]
+
+
+@pytest.mark.parametrize("include_name", ['"header.h"', "<header.h>"])
+@pytest.mark.parametrize("line_end", ["  ", " // note", " /* note */"])
+def test_include_with_trailing_spaces(tmp_path, include_name, line_end):
+    (tmp_path / "header.h").write_text("int x;\n")
+    main_path = tmp_path / "main.c"
+    main_path.write_text(f"#include {include_name}{line_end}\nint y;\n")
+
+    preprocessor = Preprocessor(Tokenizer(main_path.read_text(), str(main_path)), str(tmp_path))
+    preprocessor.include_search_dirs.append(str(tmp_path))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert [tok.value for tok in preprocessor] == ["int", "x", ";", "\n", "int", "y", ";", "\n"]
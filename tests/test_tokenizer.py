@@ -0,0 +1,168 @@
+# pyright: basic
+
+"""Tests for the tokenizer."""
+
+import pytest
+
+from pycp.errors import PycpSyntaxError
+from pycp.token import TokenKind
+from pycp.tokenizer import Tokenizer
+
+
+def test_roundtrip():
+    source = 'int main(void) {\n    return sizeof("hi") + 0x1p-3; // done\r\n}\r\n'
+    assert "".join(tok.value for tok in Tokenizer(source)) == source
+
+
+@pytest.mark.parametrize(
+    ("source", "expected_text", "expected_lineno", "expected_offsets"),
+    [
+        ('int a;\nchar *b = "abc;\nint c;\n', 'char *b = "abc;', 2, (10, 15)),
+        ('int a;\r\nchar *b = "abc;\r\nint c;', 'char *b = "abc;', 2, (10, 15)),
+        ('a \\\n"b', '"b', 2, (0, 2)),
+        ("'\\\\' '\\'", "'\\\\' '\\'", 1, (5, 8)),
+        ("/* a\nb */ `", "b */ `", 2, (5, 6)),
+    ],
+)
+def test_error_location(source, expected_text, expected_lineno, expected_offsets):
+    with pytest.raises(PycpSyntaxError) as exc_info:
+        list(Tokenizer(source, "test.c"))
+
+    exc = exc_info.value
+    assert exc.filename == "test.c"
+    assert exc.text == expected_text
+    assert exc.lineno == expected_lineno
+    assert (exc.offset, exc.end_offset) == expected_offsets
+
+
+def test_line_tracking():
+    source = "a\nb\r\nc\rd"
+    tokens = [tok for tok in Tokenizer(source) if tok.kind is TokenKind.ID]
+    assert [(tok.value, tok.lineno, tok.col_offset) for tok in tokens] == [
+        ("a", 1, 0),
+        ("b", 2, 0),
+        ("c", 3, 0),
+        ("d", 4, 0),
+    ]
+
+
+def test_line_tracking_within_tokens():
+    source = 'a /* x\r\ny\rz */ b \\\n c "\\\r\n" d'
+    tokens = [tok for tok in Tokenizer(source) if tok.kind is TokenKind.ID]
+    assert [(tok.value, tok.lineno, tok.col_offset) for tok in tokens] == [
+        ("a", 1, 0),
+        ("b", 3, 5),
+        ("c", 4, 1),
+        ("d", 5, 2),
+    ]
+
+
+def test_end_lineno():
+    source = "a /* x\r\ny\rz */ \\\r\n b\r\n"
+    tokens = [tok for tok in Tokenizer(source) if tok.kind is not TokenKind.WS]
+    assert [(tok.value, tok.lineno, tok.end_lineno) for tok in tokens] == [
+        ("a", 1, 1),
+        ("/* x\r\ny\rz */", 1, 3),
+        ("\\\r\n", 3, 3),
+        ("b", 4, 4),
+        ("\r\n", 4, 4),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("source", "expected_kind"),
+    [("   ", TokenKind.WS), ("abc", TokenKind.ID), ("été", TokenKind.ID), ("0x1p+3", TokenKind.PP_NUM)],
+)
+def test_single_token_at_end_of_source(source, expected_kind):
+    tokens = list(Tokenizer(source))
+    assert [(tok.kind, tok.value) for tok in tokens] == [(expected_kind, source)]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_newline_at_end_of_source(newline):
+    tokens = list(Tokenizer(f"x{newline}"))
+    assert [(tok.kind, tok.value) for tok in tokens] == [(TokenKind.ID, "x"), (TokenKind.NL, newline)]
+
+
+def test_tokenize_file_reuses_unchanged_files(tmp_path):
+    path = tmp_path / "header.h"
+    path.write_text("int a;\n")
+
+    first = list(Tokenizer.tokenize_file(str(path)))
+    assert "".join(tok.value for tok in first) == "int a;\n"
+    assert all(tok.filename == str(path) for tok in first)
+    assert all(a is b for a, b in zip(first, Tokenizer.tokenize_file(str(path))))
+
+    path.write_text("long bb;\n")
+    assert "".join(tok.value for tok in Tokenizer.tokenize_file(str(path))) == "long bb;\n"
+
+
+def test_tokenize_file_normalizes_path(tmp_path, monkeypatch):
+    (tmp_path / "header.h").write_text("int a;\n")
+    monkeypatch.chdir(tmp_path)
+
+    first = list(Tokenizer.tokenize_file("header.h"))
+    assert all(tok.filename == str(tmp_path / "header.h") for tok in first)
+    assert all(a is b for a, b in zip(first, Tokenizer.tokenize_file("./header.h")))
+
+
+def test_tokenize_file_uses_subclass(tmp_path):
+    seen: list[str] = []
+
+    class RecordingTokenizer(Tokenizer):
+        def identifier(self):
+            seen.append(self.filename)
+            return super().identifier()
+
+    path = tmp_path / "header.h"
+    path.write_text("int a;\n")
+
+    list(Tokenizer.tokenize_file(str(path)))
+    tokens = list(RecordingTokenizer.tokenize_file(str(path)))
+    assert "".join(tok.value for tok in tokens) == "int a;\n"
+    assert seen == [str(path), str(path)]
+
+
+def test_tokenize_file_keeps_newlines(tmp_path):
+    path = tmp_path / "header.h"
+    path.write_bytes(b"int a;\r\nint b;\rint c;\n")
+
+    tokens = list(Tokenizer.tokenize_file(str(path)))
+    assert [tok.value for tok in tokens if tok.kind is TokenKind.NL] == ["\r\n", "\r", "\n"]
+
+
+@pytest.mark.parametrize("source", ["abc", "été", "aé1", "a·b", "x_$9"])
+def test_identifier(source):
+    tokens = list(Tokenizer(f"{source}+"))
+    assert [(tok.kind, tok.value) for tok in tokens] == [(TokenKind.ID, source), (TokenKind.PLUS, "+")]
+
+
+def test_repeated_values_are_shared():
+    tokens = [tok for tok in Tokenizer("foo 10 foo 10 foo") if tok.kind is not TokenKind.WS]
+    assert tokens[0].value is tokens[2].value is tokens[4].value
+    assert tokens[1].value is tokens[3].value
+
+
+def test_skip_spaces():
+    source = "int  a; /* b */\\\n// c\r\n\tx"
+    tokens = list(Tokenizer(source, skip_spaces=True))
+    assert [(tok.value, tok.lineno, tok.col_offset) for tok in tokens] == [
+        ("int", 1, 0),
+        ("a", 1, 5),
+        (";", 1, 6),
+        ("\r\n", 2, 4),
+        ("x", 3, 1),
+    ]
+
+
+def test_subclass_handler_override():
+    seen: list[int] = []
+
+    class RecordingTokenizer(Tokenizer):
+        def identifier(self):
+            seen.append(self.current)
+            return super().identifier()
+
+    tokens = list(RecordingTokenizer("ab+cd"))
+    assert [tok.value for tok in tokens] == ["ab", "+", "cd"]
+    assert seen == [0, 3]